@@ -2,11 +2,16 @@ from .atom import (
     get_multi_historical_daily_bars,
     get_latest_price,
     get_open_price,
+    get_prices,
+    multi_quote,
+    get_multi_quote,
+    get_multi_latest_price,
+    get_multi_open_price,
     get_historical_daily_bars,
     get_minute_bars,
     get_option_dates,
     get_option_chain,
 )
-from .td_ameritrade import TDAClient
+from .td_ameritrade import AsyncTDAClient, TDAClient
 from .yahoo import YFinanceApi
 from .robinhood import RobinhoodStocks
\ No newline at end of file
@@ -0,0 +1,121 @@
+import functools
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    def __init__(self, ttl, maxsize=4096):
+        """
+        Initialize the TTLCache class.
+
+        :param ttl: The default time-to-live of an entry in seconds.
+        :param maxsize: The maximum number of entries before the least recently used is evicted.
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        Get a cached value if it has not expired.
+
+        :param key: The cache key.
+        :param default: The value returned on a miss (default None).
+        :return: The cached value or default.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            value, expiry = entry
+            if expiry <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        """
+        Store a value in the cache.
+
+        :param key: The cache key.
+        :param value: The value to store.
+        :param ttl: The time-to-live in seconds (default the cache ttl).
+        """
+        expiry = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expiry)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def add(self, key, value, ttl=None):
+        """
+        Store a value unless the key already holds an unexpired one.
+
+        :param key: The cache key.
+        :param value: The value to store.
+        :param ttl: The time-to-live in seconds (default the cache ttl).
+        """
+        if self.get(key, _MISSING) is _MISSING:
+            self.set(key, value, ttl)
+
+    def invalidate(self, ticker=None):
+        """
+        Drop cached entries for a ticker, or every entry if no ticker is given.
+
+        :param ticker: The stock ticker symbol as a string (default None).
+        """
+        with self._lock:
+            if ticker is None:
+                self._data.clear()
+                return
+            ticker = ticker.upper()
+            for key in [k for k in self._data if k[1] == ticker]:
+                del self._data[key]
+
+    def __len__(self):
+        return len(self._data)
+
+
+def ttl_cache(ttl, maxsize=4096, copy=None):
+    """
+    Cache the results of a method whose first argument is a ticker.
+
+    Entries are keyed by (method name, upper-cased ticker, other arguments).
+    The decorated method exposes ``cache``, ``key`` and ``invalidate``;
+    ``cache.ttl`` can be changed at runtime and applies to entries stored
+    afterwards. Values read straight from ``cache`` are the shared cached
+    objects and must not be modified. A method that stores its own result
+    in ``cache`` with a shorter TTL keeps that entry.
+
+    :param ttl: The time-to-live of an entry in seconds.
+    :param maxsize: The maximum number of entries kept.
+    :param copy: A callable applied to the cached value on every return, so callers
+        get their own copy of mutable results (default None, which returns it as is).
+    :return: A decorator.
+    """
+    def decorator(func):
+        cache = TTLCache(ttl, maxsize)
+
+        def key(ticker, *args, **kwargs):
+            return (func.__name__, ticker.upper()) + args + tuple(sorted(kwargs.items()))
+
+        @functools.wraps(func)
+        def wrapper(self, ticker, *args, **kwargs):
+            k = key(ticker, *args, **kwargs)
+            value = cache.get(k, _MISSING)
+            if value is _MISSING:
+                value = func(self, ticker, *args, **kwargs)
+                cache.add(k, value)
+            return value if copy is None else copy(value)
+
+        wrapper.cache = cache
+        wrapper.key = key
+        wrapper.invalidate = cache.invalidate
+        return wrapper
+    return decorator
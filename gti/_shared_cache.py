@@ -0,0 +1,169 @@
+import abc
+import sqlite3
+import threading
+import time
+
+import orjson
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+
+class SharedCache(abc.ABC):
+    """
+    A TTL cache shared between processes.
+
+    Values must be JSON-serializable. Subclasses implement get_many_with_ttl and
+    set_many so batched lookups cost a single round trip to the backend.
+    """
+
+    @abc.abstractmethod
+    def get_many_with_ttl(self, keys):
+        """
+        Get every unexpired value among the given keys with its remaining lifetime.
+
+        :param keys: A list of string keys.
+        :return: A dictionary mapping each key found to a (value, seconds left) tuple.
+        """
+
+    @abc.abstractmethod
+    def set_many(self, items, ttl):
+        """
+        Store several values with the same time-to-live.
+
+        :param items: A dictionary mapping string keys to values.
+        :param ttl: The time-to-live in seconds.
+        """
+
+    def get_many(self, keys):
+        """
+        Get every unexpired value among the given keys.
+
+        :param keys: A list of string keys.
+        :return: A dictionary mapping each key found to its value.
+        """
+        return {k: value for k, (value, _) in self.get_many_with_ttl(keys).items()}
+
+    def get_with_ttl(self, key):
+        """
+        Get a single value with its remaining lifetime.
+
+        :param key: A string key.
+        :return: A (value, seconds left) tuple, or None on a miss.
+        """
+        return self.get_many_with_ttl([key]).get(key)
+
+    def get(self, key):
+        """
+        Get a single value.
+
+        :param key: A string key.
+        :return: The cached value, or None on a miss.
+        """
+        return self.get_many([key]).get(key)
+
+    def set(self, key, value, ttl):
+        """
+        Store a single value.
+
+        :param key: A string key.
+        :param value: The value to store.
+        :param ttl: The time-to-live in seconds.
+        """
+        self.set_many({key: value}, ttl)
+
+
+class RedisBackend(SharedCache):
+    def __init__(self, url, max_connections=16):
+        """
+        Initialize the RedisBackend class.
+
+        :param url: A redis:// URL.
+        :param max_connections: The size of the connection pool (default 16).
+        """
+        if redis is None:
+            raise ImportError("RedisBackend requires the redis package")
+        pool = redis.ConnectionPool.from_url(url, max_connections=max_connections)
+        self._redis = redis.Redis(connection_pool=pool)
+
+    def get_many_with_ttl(self, keys):
+        if not keys:
+            return {}
+        pipe = self._redis.pipeline(transaction=False)
+        for key in keys:
+            pipe.get(key)
+            pipe.pttl(key)
+        results = pipe.execute()
+        found = {}
+        for key, value, pttl in zip(keys, results[::2], results[1::2]):
+            # pttl is -2 once the key has expired between the two commands
+            if value is not None and pttl != -2:
+                found[key] = (orjson.loads(value), pttl / 1000 if pttl > 0 else 0)
+        return found
+
+    def set_many(self, items, ttl):
+        if not items:
+            return
+        pipe = self._redis.pipeline(transaction=False)
+        for key, value in items.items():
+            pipe.set(key, orjson.dumps(value), px=int(ttl * 1000))
+        pipe.execute()
+
+
+class SqliteBackend(SharedCache):
+    def __init__(self, path):
+        """
+        Initialize the SqliteBackend class.
+
+        :param path: The path of the SQLite database file.
+        """
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache "
+                "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expiry REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS cache_expiry ON cache (expiry)")
+
+    def get_many_with_ttl(self, keys):
+        if not keys:
+            return {}
+        placeholders = ",".join("?" * len(keys))
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT key, value, expiry FROM cache WHERE key IN ({placeholders}) AND expiry > ?",
+                (*keys, now),
+            ).fetchall()
+        return {k: (orjson.loads(v), expiry - now) for k, v, expiry in rows}
+
+    def set_many(self, items, ttl):
+        if not items:
+            return
+        now = time.time()
+        expiry = now + ttl
+        with self._lock, self._conn:
+            # purge on write so expired rows don't accumulate
+            self._conn.execute("DELETE FROM cache WHERE expiry <= ?", (now,))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO cache (key, value, expiry) VALUES (?, ?, ?)",
+                [(k, orjson.dumps(v), expiry) for k, v in items.items()],
+            )
+
+
+def make_shared_cache(url):
+    """
+    Create a shared cache from a configuration string.
+
+    :param url: A redis://, rediss:// or unix:// URL, a SQLite file path, or '' to disable.
+    :return: A SharedCache, or None when disabled.
+    """
+    if not url:
+        return None
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBackend(url)
+    return SqliteBackend(url)
@@ -1,59 +1,281 @@
-from td_ameritrade import TDAClient
+import asyncio
+import functools
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from td_ameritrade import AsyncTDAClient, TDAClient
 from yahoo import YFinanceApi
 from robinhood import RobinhoodStocks
 
-tda = TDAClient()
-rob = RobinhoodStocks()
-yf = YFinanceApi()
+def _singleton(factory):
+    """
+    Build a client on first use, exactly once even under concurrent first calls.
+
+    :param factory: A callable taking no arguments and returning the client.
+    :return: A callable returning the shared client.
+    """
+    instance = []
+    lock = threading.Lock()
+
+    @functools.wraps(factory)
+    def get():
+        if not instance:
+            with lock:
+                if not instance:
+                    instance.append(factory())
+        return instance[0]
+    return get
+
+@_singleton
+def _tda():
+    return TDAClient()
+
+@_singleton
+def _rob():
+    return RobinhoodStocks()
+
+@_singleton
+def _yf():
+    return YFinanceApi()
+
+MAX_WORKERS = 32
+TD_QUOTE_BATCH_SIZE = 500 # max symbols accepted by TD's /marketdata/quotes
+QPS_CAP = 16 # max concurrent requests issued by multi_quote
+QUOTE_BATCH_TIMEOUT = 60 # seconds to wait on a batched TD quote, covering retries, before giving up
+
+def _fan_out(func, tickers, source):
+    """
+    Call a single-ticker getter for every ticker concurrently.
 
-def get_multi_historical_daily_bars(tickers, horizon, source='yf'):
+    :param func: A getter taking (ticker, source=...).
+    :param tickers: A list of stock ticker symbols.
+    :param source: The data source passed through to func.
+    :return: A dictionary mapping each ticker to its result.
+    """
+    tickers = list(tickers)
+    if not tickers:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(tickers))) as executor:
+        results = executor.map(lambda t: func(t, source=source), tickers)
+        return dict(zip(tickers, results))
+
+def get_multi_historical_daily_bars(tickers, horizon, source='yf', dropna_how='any'):
     if source == 'yf':
-        return yf.yf_data_multi(tickers, horizon)
+        return _yf().yf_data_multi(tickers, horizon, dropna_how=dropna_how)
     else:
         raise NotImplementedError("This data source is not supported.")
 
+class _QuoteBatcher:
+    def __init__(self, fetch, lookup=None, max_wait_ms=50, max_batch=TD_QUOTE_BATCH_SIZE, max_inflight=4):
+        """
+        Coalesce single-ticker quote requests into batched fetches.
+
+        Requests arriving within max_wait_ms of the first pending one are sent
+        together, up to max_batch symbols per fetch. Fetches run on a small
+        pool, so a slow one does not hold up collecting the next batch.
+
+        :param fetch: A callable taking a list of symbols and returning {symbol: quote}.
+        :param lookup: An optional callable returning a cached quote or None.
+        :param max_wait_ms: How long to wait for more requests before fetching.
+        :param max_batch: The maximum number of symbols per fetch.
+        :param max_inflight: The maximum number of fetches running at once (default 4).
+        """
+        self.fetch = fetch
+        self.lookup = lookup
+        self.max_wait_ms = max_wait_ms
+        self.max_batch = max_batch
+        self._executor = ThreadPoolExecutor(max_workers=max_inflight, thread_name_prefix='gti-quote-fetch')
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, ticker):
+        """
+        Request the quote for a ticker.
+
+        :param ticker: The stock ticker symbol as a string.
+        :return: A Future resolving to the quote dictionary.
+        """
+        symbol = ticker.upper()
+        future = Future()
+        cached = self.lookup(symbol) if self.lookup is not None else None
+        if cached is not None:
+            future.set_result(cached)
+            return future
+        self._queue.put((symbol, future))
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name='gti-quote-batcher', daemon=True)
+                    self._thread.start()
+        return future
+
+    def _run(self):
+        batch = []
+        try:
+            while True:
+                batch = [self._queue.get()]
+                deadline = time.monotonic() + self.max_wait_ms / 1000
+                while len(batch) < self.max_batch:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(self._queue.get(timeout=timeout))
+                    except queue.Empty:
+                        break
+                self._executor.submit(self._dispatch, batch)
+                batch = []
+        except BaseException as e:
+            # let the next submit start a fresh worker, and fail everything still waiting
+            with self._lock:
+                self._thread = None
+            error = RuntimeError(f"Quote batcher stopped: {e!r}")
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            raise
+
+    def _dispatch(self, batch):
+        try:
+            quotes = self.fetch(list(dict.fromkeys(symbol for symbol, _ in batch)))
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for symbol, future in batch:
+            if future.done():
+                continue
+            if symbol in quotes:
+                # a symbol requested twice in one batch must not share a dict
+                future.set_result(dict(quotes[symbol]))
+            else:
+                future.set_exception(KeyError(f"No quote returned for {symbol}"))
+
+def _cached_td_quote(symbol):
+    quote = TDAClient.get_stock_quote.cache.get(TDAClient.get_stock_quote.key(symbol))
+    return None if quote is None else dict(quote)
+
+quote_batcher = _QuoteBatcher(
+    lambda symbols: _tda().get_quotes(symbols),
+    lookup=_cached_td_quote,
+)
+
+def _td_quote(ticker):
+    """
+    Get a TD quote through the batcher.
+
+    Raises concurrent.futures.TimeoutError if no quote arrives within
+    QUOTE_BATCH_TIMEOUT seconds, rather than adding requests while TD is slow.
+
+    :param ticker: The stock ticker symbol as a string.
+    :return: A dictionary containing the quote.
+    """
+    return quote_batcher.submit(ticker).result(timeout=QUOTE_BATCH_TIMEOUT)
+
 def get_latest_price(ticker,source='td'):
     if source == 'td':
-        return tda.get_latest_price(ticker)
+        return _td_quote(ticker)["lastPrice"]
     if source =='rob':
-        return rob.get_latest_price(ticker)
+        return _rob().get_latest_price(ticker)
     if source == 'yf':
-        return yf.get_latest_price(ticker)
+        return _yf().get_latest_price(ticker)
 
 def get_open_price(ticker,source='td'):
     if source == 'td':
-        return tda.get_open_price(ticker)
+        return _td_quote(ticker)["openPrice"]
     if source =='rob':
-        return rob.get_open_price(ticker)
+        return _rob().get_open_price(ticker)
     if source == 'yf':
-        return yf.get_open_price(ticker)
+        return _yf().get_open_price(ticker)
+
+def get_prices(ticker, source='td'): # returns (latest price, open price)
+    if source == 'td':
+        quote = _td_quote(ticker)
+        return quote["lastPrice"], quote["openPrice"]
+    if source =='rob' or source == 'yf':
+        return get_latest_price(ticker, source=source), get_open_price(ticker, source=source)
+
+def _td_multi_quote_field(tickers, field):
+    """
+    Read one quote field for many tickers using batched TD quote requests.
+
+    :param tickers: A list of stock ticker symbols.
+    :param field: The quote field to extract, e.g. "lastPrice".
+    :return: A dictionary mapping each ticker to the field value.
+    """
+    tickers = list(tickers)
+    quotes = {}
+    for i in range(0, len(tickers), TD_QUOTE_BATCH_SIZE):
+        quotes.update(_tda().get_quotes(tickers[i:i + TD_QUOTE_BATCH_SIZE]))
+    return {t: quotes[t.upper()][field] for t in tickers}
+
+def get_multi_latest_price(tickers, source='td'): # returns {ticker: price}
+    if source == 'td':
+        return _td_multi_quote_field(tickers, 'lastPrice')
+    return _fan_out(get_latest_price, tickers, source)
+
+def get_multi_open_price(tickers, source='td'): # returns {ticker: price}
+    if source == 'td':
+        return _td_multi_quote_field(tickers, 'openPrice')
+    return _fan_out(get_open_price, tickers, source)
+
+async def multi_quote(tickers, client=None):
+    """
+    Fetch TD quotes for many tickers concurrently.
+
+    :param tickers: A list of stock ticker symbols.
+    :param client: An AsyncTDAClient to use (default None, which opens and closes one limited to QPS_CAP requests in flight).
+    :return: A dictionary mapping each ticker to its quote data.
+    """
+    tickers = list(tickers)
+    own_client = client is None
+    if own_client:
+        client = AsyncTDAClient(max_concurrency=QPS_CAP)
+    try:
+        quotes = await asyncio.gather(*(client.get_stock_quote(t) for t in tickers))
+    finally:
+        if own_client:
+            await client.close()
+    return dict(zip(tickers, quotes))
+
+def get_multi_quote(tickers): # returns {ticker: quote}
+    return asyncio.run(multi_quote(tickers))
 
 def get_historical_daily_bars(ticker, start_date,end_date, source='td'):
     if source == 'td':
-        return tda.get_historical_daily_bar(ticker, start_date, end_date)
+        return _tda().get_historical_daily_bar(ticker, start_date, end_date)
     if source =='rob':  #still trying to workout
         pass
     if source == 'yf':
-        return yf.get_historical_daily_bar(ticker,start_date,end_date)
+        return _yf().get_historical_daily_bar(ticker,start_date,end_date)
 # print(get_historical_daily_bars('spy','2021-01-01','2023-04-22',source='yf'))
 def get_minute_bars(ticker, frequency_window="1m", num_bars=None, lookback_days=5, keep_non_trading_hours=True, from_market_open=False, source='td'):
     if source == 'td':
-        return tda.get_minute_bars(ticker, frequency_window=frequency_window, num_bars=num_bars, lookback_days=lookback_days, keep_non_trading_hours=keep_non_trading_hours, from_market_open=from_market_open)
+        return _tda().get_minute_bars(ticker, frequency_window=frequency_window, num_bars=num_bars, lookback_days=lookback_days, keep_non_trading_hours=keep_non_trading_hours, from_market_open=from_market_open)
     else:
         raise NotImplementedError("This data source is not supported.")
 
 def get_option_dates(ticker,source='td'): # returns list
     if source == 'td':
-        return tda.get_option_dates(ticker)
+        return _tda().get_option_dates(ticker)
     if source =='rob':
-        return rob.get_option_dates(ticker)
+        return _rob().get_option_dates(ticker)
     if source == 'yf':
-        return yf.get_option_dates(ticker)
+        return _yf().get_option_dates(ticker)
 # print (get_option_dates('spy',source='td'))
 
 def get_option_chain(ticker, expiry_date, call_or_put=None, in_or_out=None, source='td'):
     if source == 'td':
-        return tda.get_options_data(ticker, expiry_date, call_or_put=call_or_put, in_or_out=in_or_out)
+        return _tda().get_options_data(ticker, expiry_date, call_or_put=call_or_put, in_or_out=in_or_out)
     elif source == 'rob' or source == 'yfinance':
         raise NotImplementedError("This data source is not supported.")
 # print(get_option_chain('spy','2023-05-05',source='td'))
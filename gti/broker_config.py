@@ -10,3 +10,6 @@ tda_api_key = ''
 tda_token_path = 'token' #this will create a file name token
 tda_redirect_uri = 'http://localhost'
 tda_account_id = ''
+
+# Shared cache
+shared_cache_url = '' #redis://host:6379/0 or a sqlite file path; '' disables it
@@ -1,19 +1,49 @@
+import atexit
+import copy
 import robin_stocks.robinhood.authentication as ra
+import robin_stocks.robinhood.helper as rh
 import robin_stocks.robinhood.stocks as rs
 import robin_stocks.robinhood.options as ro
 import robin_stocks.robinhood.markets as rm
+import numpy as np
 import pandas as pd
 import pyotp
+from requests.adapters import HTTPAdapter
+from _cache import ttl_cache
 from broker_config import rob_username, rob_password, rob_pyotp
 
+_QUOTE_TTL = 2.0
+_FUNDAMENTAL_TTL = 86400
+
 class RobinhoodStocks:
     def __init__(self):
+        # robin_stocks sends every request through its module-level SESSION;
+        # widen its connection pool so concurrent callers reuse connections.
+        self._session = rh.SESSION
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+        self._session.mount('https://', adapter)
+        atexit.register(self.close)
         totp = pyotp.TOTP(rob_pyotp).now()
         self.login = ra.login(username=rob_username,
                               password=rob_password,
                               store_session=True,
                               mfa_code=totp)
 
+    def close(self):
+        """
+        Close the pooled HTTP connections.
+        """
+        self._session.close()
+
+    def invalidate(self, ticker=None):
+        """
+        Drop cached quote and fundamental data.
+
+        :param ticker: The stock ticker symbol as a string (default None, which clears everything).
+        """
+        for method in (self.get_quotes, self.get_fundamental):
+            method.invalidate(ticker)
+
     def stock_info(self, ticker):
         """
         Get stock information for a given ticker.
@@ -23,6 +53,7 @@ class RobinhoodStocks:
         """
         return rs.find_instrument_data(ticker)
 
+    @ttl_cache(ttl=_FUNDAMENTAL_TTL, copy=copy.deepcopy)
     def get_fundamental(self, ticker):
         """
         Get fundamental data for a given ticker.
@@ -59,6 +90,7 @@ class RobinhoodStocks:
         """
         return rs.get_news(ticker)
 
+    @ttl_cache(ttl=_QUOTE_TTL, copy=dict)
     def get_quotes(self, ticker):
         """
         Get stock quotes for a given ticker.
@@ -96,21 +128,14 @@ class RobinhoodStocks:
         earnings_json = rs.get_earnings(ticker, info=None)
         if len(earnings_json) == 0:
             raise Exception("No Data Available")
-        else:
-            final = []
-            for i in earnings_json:
-                r = {}
-                r['year'] = i['year']
-                r['quarter'] = i['quarter']
-                r['date'] = i['report']['date']
-                r['actual_eps'] = i['eps']['actual']
-                r['estimate_eps'] = i['eps']['estimate']
-            final.append(r)
-
-        df = pd.DataFrame(final).dropna()
-        df['date'] = pd.to_datetime(df['date']).dt.date
-        df['actual_eps'] = df['actual_eps'].astype(float)
-        df['estimate_eps'] = df['estimate_eps'].astype(float)
+
+        df = pd.DataFrame({
+            'year': [i['year'] for i in earnings_json],
+            'quarter': [i['quarter'] for i in earnings_json],
+            'date': pd.to_datetime([i['report']['date'] for i in earnings_json]).date,
+            'actual_eps': np.array([i['eps']['actual'] for i in earnings_json], dtype=float),
+            'estimate_eps': np.array([i['eps']['estimate'] for i in earnings_json], dtype=float),
+        }).dropna()
         df['annual_eps'] = df['actual_eps'].rolling(4).sum()
         return df
 
@@ -157,18 +182,21 @@ class RobinhoodStocks:
         :return: P/E history as a DataFrame.
         """
         eps = self.get_earnings(ticker).drop(['year', 'quarter'], axis=1)
+        eps['date'] = pd.to_datetime(eps['date'])
+        eps = eps.sort_values('date')
         daily_close = self.get_daily_close(ticker)
+        daily_close['date'] = pd.to_datetime(daily_close['date'])
+        daily_close = daily_close.sort_values('date')
         daily_close['close_avg'] = daily_close['close'].rolling(avg_window).mean()
-        latest_daily = daily_close.tail(1)
-        result = pd.merge(left=eps,
-                        right=daily_close,
-                        how='left',
-                        on='date')
-        add_latest = pd.concat([result, latest_daily], ignore_index=True).fillna(method='ffill')
-        add_latest['pe'] = add_latest['close'] / add_latest['annual_eps']
-        add_latest['pe_close_avg'] = add_latest['close_avg'] / add_latest['annual_eps']
-        r = add_latest.dropna().copy()
+        # one row per report with the last close on or before it, plus the latest close
+        reports = pd.merge_asof(eps, daily_close, on='date', direction='backward')
+        latest = pd.merge_asof(daily_close.tail(1), eps, on='date', direction='backward')
+        result = pd.concat([reports, latest], ignore_index=True)
+        result['pe'] = result['close'] / result['annual_eps']
+        result['pe_close_avg'] = result['close_avg'] / result['annual_eps']
+        r = result.dropna().copy()
         r['pe_pct_change'] = r['pe'].pct_change()
+        r['date'] = r['date'].dt.date
         return r
 
     def get_pe_rolling(self, ticker):
@@ -179,11 +207,13 @@ class RobinhoodStocks:
         :return: Rolling P/E as a DataFrame.
         """
         eps = self.get_earnings(ticker)
+        eps['date'] = pd.to_datetime(eps['date'])
         daily_close = self.get_daily_close(ticker)
-        result = pd.merge(left=daily_close,
-                        right=eps,
-                        how='left',
-                        on='date').fillna(method='ffill')
+        daily_close['date'] = pd.to_datetime(daily_close['date'])
+        result = pd.merge_asof(daily_close.sort_values('date'),
+                               eps.sort_values('date'),
+                               on='date',
+                               direction='backward')
         result['pe_ratio'] = result['close'] / result['annual_eps']
+        result['date'] = result['date'].dt.date
         return result.dropna()
-
@@ -1,7 +1,14 @@
-import json
+import atexit
+import copy
+import orjson
 import pytz
 import asyncio
+import concurrent.futures
 import datetime
+import threading
+import httpx
+import tenacity
+import numpy as np
 import pandas as pd
 import os
 from tda import auth, client
@@ -9,13 +16,114 @@ from tda.streaming import StreamClient
 from selenium import webdriver
 from webdriver_manager.chrome import ChromeDriverManager
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+from _cache import ttl_cache
+from _shared_cache import make_shared_cache
 from broker_config import (
     tda_token_path,
     tda_api_key,
     tda_redirect_uri,
     tda_account_id,
+    shared_cache_url,
+)
+
+_QUOTE_TTL = 2.0
+_FUNDAMENTAL_TTL = 86400
+_OPTION_DATES_TTL = 3600
+
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_MAX_INFLIGHT = 16 # caps concurrent requests only; TD's per-minute rate limit surfaces as 429s, which _retry backs off on
+
+# Retries throttled and failed requests with jittered exponential backoff. Once
+# attempts run out the last response is returned (or the last error raised) so
+# callers see the same outcome they would have without the retry.
+_retry = tenacity.retry(
+    retry=(
+        tenacity.retry_if_result(lambda response: response.status_code in _RETRY_STATUSES)
+        | tenacity.retry_if_exception_type(httpx.TransportError)
+    ),
+    wait=tenacity.wait_random_exponential(multiplier=0.1, max=10),
+    stop=tenacity.stop_after_attempt(5),
+    retry_error_callback=lambda retry_state: retry_state.outcome.result(),
+)
+
+_CANDLE_FIELDS = (
+    ("Open", "open", np.float64),
+    ("High", "high", np.float64),
+    ("Low", "low", np.float64),
+    ("Close", "close", np.float64),
+    ("Volume", "volume", np.int64),
+)
+_CANDLE_COLS = tuple(name for name, _, _ in _CANDLE_FIELDS)
+
+_PACIFIC = pytz.timezone("US/Pacific")
+
+_PRICE_HISTORY = client.Client.PriceHistory
+_MINUTE_PERIOD_TYPE = _PRICE_HISTORY.PeriodType.DAY
+_MINUTE_FREQUENCY_TYPE = _PRICE_HISTORY.FrequencyType.MINUTE
+_MINUTE_FREQUENCIES = {
+    "1m": _PRICE_HISTORY.Frequency.EVERY_MINUTE,
+    "5m": _PRICE_HISTORY.Frequency.EVERY_FIVE_MINUTES,
+    "10m": _PRICE_HISTORY.Frequency.EVERY_TEN_MINUTES,
+    "15m": _PRICE_HISTORY.Frequency.EVERY_FIFTEEN_MINUTES,
+    "30m": _PRICE_HISTORY.Frequency.EVERY_THIRTY_MINUTES,
+}
+
+_OPTION_FIELDS = (
+    ("strike", "strikePrice"),
+    ("bid", "bid"),
+    ("ask", "ask"),
+    ("lastPrice", "last"),
+    ("putCall", "putCall"),
+    ("inTheMoney", "inTheMoney"),
 )
 
+def _candle_arrays(candles):
+    """
+    Convert TD candle records into column arrays.
+
+    :param candles: The "candles" list of a price history response.
+    :return: A tuple of (epoch milliseconds array, {column name: array}).
+    """
+    n = len(candles)
+    timestamps = np.fromiter((c["datetime"] for c in candles), dtype=np.int64, count=n)
+    columns = {
+        name: np.fromiter((c[field] for c in candles), dtype=dtype, count=n)
+        for name, field, dtype in _CANDLE_FIELDS
+    }
+    return timestamps, columns
+
+def _daily_history_params(start_date, end_date):
+    """
+    Build the get_price_history arguments for daily bars.
+
+    :param start_date: The start date as a string in the format "%Y-%m-%d".
+    :param end_date: The end date as a string in the format "%Y-%m-%d".
+    :return: A dictionary of keyword arguments.
+    """
+    return dict(
+        period_type=_PRICE_HISTORY.PeriodType.YEAR,
+        start_datetime=datetime.datetime.strptime(start_date, "%Y-%m-%d"),
+        end_datetime=datetime.datetime.strptime(end_date, "%Y-%m-%d"),
+        frequency_type=_PRICE_HISTORY.FrequencyType.DAILY,
+        need_extended_hours_data=None,
+    )
+
+def _daily_bars_frame(candles):
+    """
+    Build the daily bar DataFrame from TD candles.
+
+    :param candles: The "candles" list of a price history response.
+    :return: A DataFrame with daily bars indexed by date.
+    """
+    timestamps, columns = _candle_arrays(candles)
+    dates = pd.Index(pd.to_datetime(timestamps, utc=True, unit="ms").date, name="Date")
+    return pd.DataFrame(columns, index=dates, columns=_CANDLE_COLS)
+
 class TDAClient:
     def __init__(self):
         """
@@ -24,6 +132,12 @@ class TDAClient:
         self.class_dir = os.path.dirname(os.path.abspath(__file__))
         self.token_path = os.path.join(self.class_dir, 'token')
         self.client = self.authentication()
+        # tda-api keeps a single keep-alive httpx session on the client;
+        # hold on to it so it can be closed cleanly at exit.
+        self._session = self.client.session
+        atexit.register(self.close)
+        self.shared_cache = make_shared_cache(shared_cache_url)
+        self._qps_sem = threading.BoundedSemaphore(_MAX_INFLIGHT)
 
     def authentication(self):
         """
@@ -41,6 +155,26 @@ class TDAClient:
             c = auth.client_from_login_flow(driver, tda_api_key, tda_redirect_uri, tda_token_path)
         return c
 
+    def close(self):
+        """
+        Close the underlying HTTP session.
+        """
+        self._session.close()
+
+    @_retry
+    def _request(self, method, *args, **kwargs):
+        with self._qps_sem:
+            return method(*args, **kwargs)
+
+    def invalidate(self, ticker=None):
+        """
+        Drop cached quote, fundamental and option date data.
+
+        :param ticker: The stock ticker symbol as a string (default None, which clears everything).
+        """
+        for method in (self.get_stock_quote, self.get_stock_fundamental, self.get_option_dates):
+            method.invalidate(ticker)
+
     @staticmethod
     def is_trading_hour(dt):
         """
@@ -49,13 +183,42 @@ class TDAClient:
         :param dt: A datetime object.
         :return: A boolean indicating if it is within trading hours.
         """
-        dt_pacific = dt.tz_convert("US/Pacific")
+        dt_pacific = dt.tz_convert(_PACIFIC)
         hour = dt_pacific.hour
         minute = dt_pacific.minute
         weekday = dt_pacific.weekday()
 
         return (6, 30) <= (hour, minute) < (13, 0) and weekday < 5
 
+    @staticmethod
+    def is_trading_hour_vec(times):
+        """
+        Check which timestamps in an array are within trading hours.
+
+        Vectorized equivalent of is_trading_hour for masking bar arrays.
+        Datetime input of any unit is converted as is; naive values are read
+        as UTC. Pass a DatetimeIndex itself rather than its asi8, whose unit
+        is not always nanoseconds.
+
+        :param times: A DatetimeIndex, a datetime64 array or Series, or a numpy int64 array of UTC epoch nanoseconds.
+        :return: A numpy boolean array, True where the timestamp is within trading hours.
+        """
+        dtype = getattr(times, 'dtype', None)
+        if dtype is None:
+            times = np.asarray(times)
+            dtype = times.dtype
+        if dtype.kind == 'M':
+            idx = pd.DatetimeIndex(times)
+            idx = idx.tz_localize('UTC') if idx.tz is None else idx
+        elif dtype.kind in 'iu':
+            idx = pd.to_datetime(np.asarray(times, dtype=np.int64), unit="ns", utc=True)
+        else:
+            raise TypeError(f"Expected datetime64 or int64 epoch nanoseconds, got {dtype}")
+        dt_pacific = idx.tz_convert(_PACIFIC)
+        minute_of_day = np.asarray(dt_pacific.hour) * 60 + np.asarray(dt_pacific.minute)
+        weekday = np.asarray(dt_pacific.weekday)
+        return (minute_of_day >= 6 * 60 + 30) & (minute_of_day < 13 * 60) & (weekday < 5)
+
     def get_historical_daily_bar(self, ticker, start_date, end_date):
         """
         Get historical daily bars for a given ticker.
@@ -65,37 +228,14 @@ class TDAClient:
         :param end_date: The end date as a string in the format "%Y-%m-%d".
         :return: A DataFrame with historical daily bars.
         """
-        start_date = datetime.datetime.strptime(start_date, "%Y-%m-%d")
-        end_date = datetime.datetime.strptime(end_date, "%Y-%m-%d")
-        base = client.Client.PriceHistory
-        r = (
-            self.client.get_price_history(
-                ticker.upper(),
-                period_type=base.PeriodType.YEAR,
-                start_datetime=start_date,
-                end_datetime=end_date,
-                frequency_type=base.FrequencyType.DAILY,
-                need_extended_hours_data=None,
-            )
-            .json()["candles"]
-        )
-        df = pd.DataFrame(r)
-        df["datetime"] = (
-            pd.to_datetime(df["datetime"], utc=True, unit="ms")
-            .dt.date
-        )
-        df = df.rename(
-            columns={
-                "datetime": "Date",
-                "open": "Open",
-                "high": "High",
-                "low": "Low",
-                "close": "Close",
-                "volume": "Volume",
-            }
+        response = self._request(
+            self.client.get_price_history,
+            ticker.upper(),
+            **_daily_history_params(start_date, end_date),
         )
-        return df[["Date", "Open", "High", "Low", "Close", "Volume"]].set_index("Date")
+        return _daily_bars_frame(orjson.loads(response.content)["candles"])
 
+    @ttl_cache(ttl=_QUOTE_TTL, copy=dict)
     def get_stock_quote(self, ticker):
         """
         Get the stock quote for a given ticker.
@@ -103,11 +243,61 @@ class TDAClient:
         :param ticker: The stock ticker symbol as a string.
         :return: A dictionary containing stock quote data.
         """
-       
-        quote = self.client.get_quote(ticker.upper()).json()
+        key = f"quote:{ticker.upper()}"
+        if self.shared_cache is not None:
+            cached = self.shared_cache.get_with_ttl(key)
+            if cached is not None:
+                # keep only the shared entry's remaining lifetime locally
+                quote, ttl = cached
+                self.get_stock_quote.cache.set(self.get_stock_quote.key(ticker), quote, ttl)
+                return quote
+        quote = orjson.loads(self._request(self.client.get_quote, ticker.upper()).content)
         first_item = next(iter(quote.items()))[1]
+        if self.shared_cache is not None:
+            self.shared_cache.set(key, first_item, _QUOTE_TTL)
         return first_item
 
+    def get_quotes(self, tickers):
+        """
+        Get stock quotes for several tickers in a single request.
+
+        Quotes still held by the get_stock_quote caches are served from them and
+        the quotes fetched here are added to them.
+
+        :param tickers: A list of stock ticker symbols.
+        :return: A dictionary mapping each upper-cased symbol to its quote data.
+        """
+        cache = self.get_stock_quote.cache
+        key = self.get_stock_quote.key
+        quotes = {}
+        missing = []
+        for symbol in dict.fromkeys(t.upper() for t in tickers):
+            quote = cache.get(key(symbol))
+            if quote is None:
+                missing.append(symbol)
+            else:
+                quotes[symbol] = quote
+        if missing and self.shared_cache is not None:
+            shared = self.shared_cache.get_many_with_ttl([f"quote:{symbol}" for symbol in missing])
+            for symbol in missing:
+                cached = shared.get(f"quote:{symbol}")
+                if cached is not None:
+                    quote, ttl = cached
+                    cache.set(key(symbol), quote, ttl)
+                    quotes[symbol] = quote
+            missing = [symbol for symbol in missing if symbol not in quotes]
+        if missing:
+            fetched = orjson.loads(self._request(self.client.get_quotes, missing).content)
+            for symbol, quote in fetched.items():
+                cache.set(key(symbol), quote)
+            if self.shared_cache is not None:
+                self.shared_cache.set_many(
+                    {f"quote:{symbol}": quote for symbol, quote in fetched.items()}, _QUOTE_TTL
+                )
+            quotes.update(fetched)
+        # the cache holds the same dicts, so hand out copies
+        return {symbol: dict(quote) for symbol, quote in quotes.items()}
+
     def get_latest_price(self, ticker):
         """
         Get the latest price for a given ticker.
@@ -117,6 +307,16 @@ class TDAClient:
         """
         return self.get_stock_quote(ticker)["lastPrice"]
 
+    def get_prices(self, ticker):
+        """
+        Get the latest and open price for a given ticker from one quote.
+
+        :param ticker: The stock ticker symbol as a string.
+        :return: A tuple of floats (latest price, open price).
+        """
+        quote = self.get_stock_quote(ticker)
+        return quote["lastPrice"], quote["openPrice"]
+
     def get_minute_bars(
         self,
         ticker,
@@ -137,39 +337,27 @@ class TDAClient:
         :param from_market_open: Whether to retrieve data from the market open (default False).
         :return: A DataFrame with minute bars.
         """
-        pacific = pytz.timezone("US/Pacific")
-        end_date = datetime.datetime.now(pacific)
+        end_date = datetime.datetime.now(_PACIFIC)
 
         if from_market_open:
-            now = datetime.datetime.now(pytz.timezone("US/Pacific"))
-            if now.weekday() >= 5:
-                days_ahead = 7 - now.weekday()
-                now = now + datetime.timedelta(days=days_ahead)
-            stock_market_open = now.replace(hour=6, minute=30, second=0, microsecond=0)
+            market_day = end_date
+            if market_day.weekday() >= 5:
+                days_ahead = 7 - market_day.weekday()
+                market_day = market_day + datetime.timedelta(days=days_ahead)
+            stock_market_open = market_day.replace(hour=6, minute=30, second=0, microsecond=0)
             start_date = stock_market_open
         else:
             start_date = end_date - datetime.timedelta(lookback_days)
 
-        period_type = self.client.PriceHistory.PeriodType.DAY
-        frequency_type = self.client.PriceHistory.FrequencyType.MINUTE
-
-        if frequency_window == "1m":
-            frequency = self.client.PriceHistory.Frequency.EVERY_MINUTE
-        elif frequency_window == "5m":
-            frequency = self.client.PriceHistory.Frequency.EVERY_FIVE_MINUTES
-        elif frequency_window == "10m":
-            frequency = self.client.PriceHistory.Frequency.EVERY_TEN_MINUTES
-        elif frequency_window == "15m":
-            frequency = self.client.PriceHistory.Frequency.EVERY_FIFTEEN_MINUTES
-        elif frequency_window == "30m":
-            frequency = self.client.PriceHistory.Frequency.EVERY_THIRTY_MINUTES
-        else:
+        frequency = _MINUTE_FREQUENCIES.get(frequency_window)
+        if frequency is None:
             raise ValueError("Please select from 1m, 5m, 10m, 15m, 30m")
 
-        history_response = self.client.get_price_history(
+        history_response = self._request(
+            self.client.get_price_history,
             ticker.upper(),
-            period_type=period_type,
-            frequency_type=frequency_type,
+            period_type=_MINUTE_PERIOD_TYPE,
+            frequency_type=_MINUTE_FREQUENCY_TYPE,
             frequency=frequency,
             start_datetime=start_date,
             end_datetime=end_date,
@@ -177,24 +365,13 @@ class TDAClient:
         )
 
         if history_response.status_code == 200:
-            history_data = history_response.json()["candles"]
-            df = pd.DataFrame(history_data)
-            df["datetime"] = pd.to_datetime(df["datetime"], unit="ms")
-            df["datetime"] = df["datetime"].dt.tz_localize("UTC").dt.tz_convert(pacific)
-            df["datetime"] = df["datetime"].dt.tz_localize(None)
+            history_data = orjson.loads(history_response.content)["candles"]
+            timestamps, columns = _candle_arrays(history_data)
+            dates = pd.to_datetime(timestamps, unit="ms", utc=True).tz_convert(_PACIFIC).tz_localize(None)
+            df = pd.DataFrame(columns, index=dates.rename("Date"), columns=_CANDLE_COLS)
             if num_bars is not None:
-                latest_bars = df.tail(num_bars)
-            latest_bars = df.rename(
-                columns={
-                    "datetime": "Date",
-                    "open": "Open",
-                    "high": "High",
-                    "low": "Low",
-                    "close": "Close",
-                    "volume": "Volume",
-                }
-            )
-            return latest_bars[["Date", "Open", "High", "Low", "Close", "Volume"]].set_index("Date")
+                df = df.tail(num_bars)
+            return df
         else:
             print(f"Error retrieving data for {ticker}: {history_response.status_code}")
             return None
@@ -208,28 +385,50 @@ class TDAClient:
         """
         return self.get_stock_quote(ticker)["openPrice"]
 
+    @ttl_cache(ttl=_FUNDAMENTAL_TTL, copy=copy.deepcopy)
     def get_stock_fundamental(self, ticker):
         """
         Get the stock fundamental data for a given ticker.
 
         :param ticker: The stock ticker symbol as a string.
-        :return: A JSON-formatted string containing fundamental data.
+        :return: A dictionary containing fundamental data.
         """
-        response = self.client.search_instruments(
-            [ticker], self.client.Instrument.Projection.FUNDAMENTAL
+        response = self._request(
+            self.client.search_instruments,
+            [ticker],
+            self.client.Instrument.Projection.FUNDAMENTAL,
         )
-        return json.dumps(response.json(), indent=4)
+        return orjson.loads(response.content)
+
+    def get_stock_fundamental_json(self, ticker):
+        """
+        Get the stock fundamental data for a given ticker as pretty-printed JSON.
+
+        :param ticker: The stock ticker symbol as a string.
+        :return: A JSON-formatted string containing fundamental data.
+        """
+        return orjson.dumps(self.get_stock_fundamental(ticker), option=orjson.OPT_INDENT_2).decode()
 
     def get_option_chain(self, ticker):
         """
         Get the option chain for a given ticker.
 
+        :param ticker: The stock ticker symbol as a string.
+        :return: A dictionary containing the option chain data.
+        """
+        response = self._request(self.client.get_option_chain, ticker.upper())
+        return orjson.loads(response.content)
+
+    def get_option_chain_json(self, ticker):
+        """
+        Get the option chain for a given ticker as pretty-printed JSON.
+
         :param ticker: The stock ticker symbol as a string.
         :return: A JSON-formatted string containing the option chain data.
         """
-        response = self.client.get_option_chain(ticker.upper())
-        return json.dumps(response.json(), indent=4)
+        return orjson.dumps(self.get_option_chain(ticker), option=orjson.OPT_INDENT_2).decode()
 
+    @ttl_cache(ttl=_OPTION_DATES_TTL, copy=list)
     def get_option_dates(self, ticker):
         """
         Get the option expiration dates for a given ticker.
@@ -237,17 +436,28 @@ class TDAClient:
         :param ticker: The stock ticker symbol as a string.
         :return: A list of option expiration dates as strings.
         """
-        response = self.client.get_option_chain(
-            ticker.upper(), contract_type=self.client.Options.ContractType.ALL
+        key = f"option_dates:{ticker.upper()}"
+        if self.shared_cache is not None:
+            cached = self.shared_cache.get_with_ttl(key)
+            if cached is not None:
+                dates, ttl = cached
+                self.get_option_dates.cache.set(self.get_option_dates.key(ticker), dates, ttl)
+                return dates
+        response = self._request(
+            self.client.get_option_chain,
+            ticker.upper(),
+            contract_type=self.client.Options.ContractType.ALL,
         )
         response.raise_for_status()
-        option_data = response.json()
+        option_data = orjson.loads(response.content)
         options_dates = []
 
         for date_type in ["callExpDateMap", "putExpDateMap"]:
             for date in option_data[date_type]:
                 date = date.split(":")[0]
                 options_dates.append(date)
+        if self.shared_cache is not None:
+            self.shared_cache.set(key, options_dates, _OPTION_DATES_TTL)
         return options_dates
 
     def get_options_data(
@@ -262,8 +472,11 @@ class TDAClient:
         :param in_or_out: The option moneyness as a string, either "in" or "out" (default None).
         :return: A DataFrame containing options data.
         """
+        if call_or_put not in (None, "call", "put"):
+            return "please input call or put"
         expiry_date = datetime.datetime.strptime(strike_date, "%Y-%m-%d").date()
-        response = self.client.get_option_chain(
+        response = self._request(
+            self.client.get_option_chain,
             symbol.upper(),
             strike=strike_price,
             contract_type=self.client.Options.ContractType.ALL,
@@ -271,47 +484,128 @@ class TDAClient:
             to_date=expiry_date)
 
         response.raise_for_status()
-        option_data = response.json()
-        options_list = []
+        option_data = orjson.loads(response.content)
+        options = [
+            option
+            for date_type in ("callExpDateMap", "putExpDateMap")
+            for strikes in option_data[date_type].values()
+            for option_list in strikes.values()
+            for option in option_list
+        ]
+        result = pd.DataFrame(
+            {name: [option[field] for option in options] for name, field in _OPTION_FIELDS}
+        )
 
-        for date_type in ["callExpDateMap", "putExpDateMap"]:
-            for date in option_data[date_type]:
-                for strike in option_data[date_type][date]:
-                    for option in option_data[date_type][date][strike]:
-                        if float(strike) == option["strikePrice"]:
-                            options_list.append(option)
-
-        result = pd.DataFrame(options_list)
-        if call_or_put is None:
-            result = result
-        elif call_or_put == "call":
-            result = result.loc[result["putCall"] == "CALL"]
-        elif call_or_put == "put":
-            result = result.loc[result["putCall"] == "PUT"]
-        else:
-            return "please input call or put"
+        mask = np.ones(len(result), dtype=bool)
+        if call_or_put is not None:
+            mask &= result["putCall"].to_numpy() == call_or_put.upper()
+        if in_or_out in ("in", "out"):
+            mask &= result["inTheMoney"].to_numpy() == (in_or_out == "in")
+        return result.loc[mask, ["strike", "bid", "ask", "lastPrice"]]
+
+class AsyncTDAClient:
+    def __init__(self, max_concurrency=_MAX_INFLIGHT):
+        """
+        Initialize the AsyncTDAClient class.
+
+        Reuses the token file written by TDAClient's authentication flow.
+
+        :param max_concurrency: The maximum number of requests in flight (default 16).
+        """
+        self.class_dir = os.path.dirname(os.path.abspath(__file__))
+        self.token_path = os.path.join(self.class_dir, 'token')
+        self.client = auth.client_from_token_file(self.token_path, tda_api_key, asyncio=True)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def close(self):
+        """
+        Close the underlying HTTP session.
+        """
+        await self.client.close_async_session()
+
+    @_retry
+    async def _request(self, method, *args, **kwargs):
+        async with self._semaphore:
+            return await method(*args, **kwargs)
+
+    async def get_stock_quote(self, ticker):
+        """
+        Get the stock quote for a given ticker.
+
+        :param ticker: The stock ticker symbol as a string.
+        :return: A dictionary containing stock quote data.
+        """
+        response = await self._request(self.client.get_quote, ticker.upper())
+        quote = orjson.loads(response.content)
+        return next(iter(quote.values()))
 
-        result = result.loc[result['inTheMoney'] == True] if in_or_out == 'in' else result.loc[result['inTheMoney'] == False] if in_or_out == 'out' else result
-        result = result.rename(columns={"strikePrice": "strike", "last": "lastPrice"})
-        return result[["strike", "bid", "ask", "lastPrice"]]
+    async def get_price_history(self, ticker, start_date, end_date):
+        """
+        Get historical daily bars for a given ticker.
+
+        :param ticker: The stock ticker symbol as a string.
+        :param start_date: The start date as a string in the format "%Y-%m-%d".
+        :param end_date: The end date as a string in the format "%Y-%m-%d".
+        :return: A DataFrame with historical daily bars.
+        """
+        response = await self._request(
+            self.client.get_price_history,
+            ticker.upper(),
+            **_daily_history_params(start_date, end_date),
+        )
+        return _daily_bars_frame(orjson.loads(response.content)["candles"])
+
+    async def get_option_chain(self, ticker):
+        """
+        Get the option chain for a given ticker.
+
+        :param ticker: The stock ticker symbol as a string.
+        :return: A dictionary containing the option chain data.
+        """
+        response = await self._request(self.client.get_option_chain, ticker.upper())
+        return orjson.loads(response.content)
 
 class TdaStream:
-    def __init__(self, tda_client):
+    def __init__(self, tda_client, max_workers=1):
         """
         Initialize the TdaStream class.
 
         :param tda_client: An instance of the TDAClient class.
+        :param max_workers: The number of threads processing order book messages (default 1,
+            which keeps them in arrival order; more threads may process them out of order).
         """
         self._client = tda_client
         self._stream_client = StreamClient(self._client, account_id=tda_account_id)
+        self._max_workers = max_workers
+        self._pool = None
 
     def order_book_handler(self, msg):
         """
-        Handle order book messages.
+        Hand an order book message to the worker pool so the stream loop keeps reading.
+
+        Without a pool (read_stream driven directly) the message is processed inline.
 
         :param msg: A message containing order book data.
         """
-        print(json.dumps(msg, indent=4))
+        if self._pool is None:
+            self.process_book(msg)
+            return
+        future = self._pool.submit(self.process_book, msg)
+        future.add_done_callback(self._report_book_error)
+
+    def process_book(self, msg):
+        """
+        Process an order book message on a worker thread.
+
+        :param msg: A message containing order book data.
+        """
+        print(orjson.dumps(msg, option=orjson.OPT_INDENT_2).decode())
+
+    @staticmethod
+    def _report_book_error(future):
+        error = future.exception()
+        if error is not None:
+            print(f"Error processing order book message: {error!r}")
 
     async def read_stream(self):
         """
@@ -328,9 +622,20 @@ class TdaStream:
 
     def start_data_stream(self):
         """
-        Start the data stream.
+        Start the data stream, on uvloop when it is installed.
+
+        Each run gets its own order book worker pool, shut down once the
+        stream stops, so the stream can be started again after a disconnect.
         """
-        asyncio.get_event_loop().run_until_complete(self.read_stream())
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=self._max_workers)
+        try:
+            if uvloop is not None:
+                uvloop.run(self.read_stream())
+            else:
+                asyncio.run(self.read_stream())
+        finally:
+            pool, self._pool = self._pool, None
+            pool.shutdown(wait=True)
 
 
 
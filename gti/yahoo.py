@@ -1,13 +1,92 @@
-import yfinance as yf
+import copy
+import datetime
+import functools
+import os
+import threading
+import time
+import numpy as np
 import pandas as pd
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+from _cache import TTLCache, ttl_cache
+
+_DOWNLOAD_CHUNK_SIZE = 20 # symbols per Yahoo download request
+_OPTION_TTL = 300
+_TICKER_TTL = 300 # yfinance Tickers memoize info and options, so rebuild them this often
+_BARS_CACHE_TTL = 86400 # adjusted bars change after splits and dividends, so re-download daily
+
+@functools.lru_cache(maxsize=None)
+def _get_yf():
+    """
+    Import yfinance on first use so importing this module stays cheap.
+
+    :return: The yfinance module.
+    """
+    import yfinance
+    return yfinance
+
+def _normalize_ticker(func):
+    """
+    Upper-case the ticker argument once before calling the method.
+
+    :param func: A method whose first argument after self is a ticker.
+    :return: The wrapped method.
+    """
+    @functools.wraps(func)
+    def wrapper(self, ticker, *args, **kwargs):
+        return func(self, ticker.upper(), *args, **kwargs)
+    return wrapper
 
 class YFinanceApi:
     def __init__(self):
         """
         Initialize the YFinanceApi class.
         """
-        pass
+        self._cache_dir = Path('~/.gti_cache').expanduser()
+        self._ticker_cache = TTLCache(ttl=_TICKER_TTL, maxsize=1024)
+
+    def _ticker(self, ticker):
+        """
+        Get the shared yfinance Ticker object for a ticker.
+
+        The Ticker is rebuilt every _TICKER_TTL seconds, since yfinance keeps
+        whatever it fetched first on the object.
+
+        :param ticker: The upper-cased stock ticker symbol.
+        :return: A yfinance Ticker.
+        """
+        key = ('ticker', ticker)
+        stock = self._ticker_cache.get(key)
+        if stock is None:
+            stock = _get_yf().Ticker(ticker)
+            self._ticker_cache.set(key, stock)
+        return stock
+
+    def _info(self, ticker):
+        """
+        Get the info dictionary for a ticker, refreshed with its Ticker object.
+
+        :param ticker: The upper-cased stock ticker symbol.
+        :return: A copy of the Ticker's memoized dictionary of ticker information.
+        """
+        return copy.deepcopy(self._ticker(ticker).info)
+
+    @staticmethod
+    def _batch(func, tickers, max_workers):
+        """
+        Call a single-ticker method for several tickers concurrently.
+
+        :param func: A callable taking a ticker.
+        :param tickers: A list of stock ticker symbols.
+        :param max_workers: The maximum number of concurrent requests.
+        :return: A dictionary mapping each ticker to its result.
+        """
+        tickers = list(tickers)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return dict(zip(tickers, executor.map(func, tickers)))
 
+    @_normalize_ticker
     def get_historical_daily_bar(self, ticker, start_date, end_date):
         """
         Get historical daily bar data for a specific ticker.
@@ -17,35 +96,124 @@ class YFinanceApi:
         :param end_date: The end date for the data.
         :return: A DataFrame containing historical daily bar data.
         """
-        stock = yf.Ticker(ticker.upper())
+        start, end = pd.Timestamp(start_date).date(), pd.Timestamp(end_date).date()
+        path = self._cache_dir / f"{ticker}_{start}_{end}_adjusted.parquet"
+        if path.exists() and time.time() - path.stat().st_mtime < _BARS_CACHE_TTL:
+            return pd.read_parquet(path)
+        stock = self._ticker(ticker)
         df = stock.history(start=start_date, end=end_date)
-        df.reset_index(inplace=True)
-        df['Date'] = pd.to_datetime(df['Date']).dt.strftime('%Y-%m-%d')
-        return df[['Date', 'Open', 'High', 'Low', 'Close', 'Volume']].set_index('Date')
+        if isinstance(df.index, pd.DatetimeIndex):
+            df.index = df.index.tz_localize(None).normalize().rename('Date')
+        else:
+            # yfinance returns an empty frame on a plain Index when there is no data
+            df.index = pd.DatetimeIndex(df.index, name='Date')
+        bars = df[['Open', 'High', 'Low', 'Close', 'Volume']]
+        # only non-empty ranges of closed trading days are worth keeping on disk
+        if not bars.empty and end < datetime.date.today():
+            self._save_bars(bars, path)
+        return bars
+
+    def get_historical_daily_bar_arrays(self, ticker, start_date, end_date):
+        """
+        Get historical daily bar data as plain numpy arrays.
+
+        Intended as the entry point for numba @njit indicator code, which cannot
+        take DataFrames.
+
+        :param ticker: The stock ticker symbol.
+        :param start_date: The start date for the data.
+        :param end_date: The end date for the data.
+        :return: A tuple (dates, open, high, low, close, volume) of int64 epoch-nanosecond dates and float64 arrays.
+        """
+        bars = self.get_historical_daily_bar(ticker, start_date, end_date)
+        dates = bars.index.to_numpy(dtype='datetime64[ns]').view(np.int64)
+        return (dates,) + tuple(
+            bars[col].to_numpy(dtype=np.float64) for col in ('Open', 'High', 'Low', 'Close', 'Volume')
+        )
+
+    def _save_bars(self, bars, path):
+        """
+        Write daily bars to the on-disk cache on a best-effort basis.
+
+        The write is skipped if no parquet engine is installed or the cache
+        directory cannot be written. The file is written under a temporary name
+        and renamed into place, so readers never see a partial file.
+
+        :param bars: A DataFrame of daily bars.
+        :param path: The parquet file path.
+        """
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            bars.to_parquet(tmp)
+            os.replace(tmp, path)
+        except (ImportError, OSError, ValueError): # ValueError covers pyarrow's ArrowInvalid
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+
+    def get_historical_daily_bar_multi(self, tickers, start_date, end_date):
+        """
+        Get historical daily bar data for several tickers with batched downloads.
+
+        :param tickers: A list of stock ticker symbols.
+        :param start_date: The start date for the data.
+        :param end_date: The end date for the data.
+        :return: A dictionary mapping each ticker to a DataFrame of daily bars.
+        """
+        symbols = list(dict.fromkeys(t.upper() for t in tickers))
+        bars = {}
+        for i in range(0, len(symbols), _DOWNLOAD_CHUNK_SIZE):
+            chunk = symbols[i:i + _DOWNLOAD_CHUNK_SIZE]
+            raw = _get_yf().download(
+                tickers=' '.join(chunk),
+                start=start_date,
+                end=end_date,
+                group_by='ticker',
+                threads=True,
+                auto_adjust=True,
+                progress=False,
+            )
+            for symbol in chunk:
+                df = raw[symbol] if isinstance(raw.columns, pd.MultiIndex) else raw
+                bars[symbol] = df[['Open', 'High', 'Low', 'Close', 'Volume']].dropna()
+        return {t: bars[t.upper()] for t in tickers}
 
-    def yf_data_multi(self, tickers, horizon):
+    def yf_data_multi(self, tickers, horizon, dropna_how='any'):
         """
         Get historical data for multiple tickers.
 
         :param tickers: A list of stock ticker symbols.
         :param horizon: The horizon for the data (e.g., '1y', '1m', '1d').
+        :param dropna_how: Drop dates missing 'any' ticker's close or only those missing 'all' of them (default 'any').
         :return: A DataFrame containing historical data for multiple tickers.
         """
-        data = yf.download(
-                tickers = str(tickers).replace("[","").replace("]","").replace("'","").replace(",",""),
+        if dropna_how not in ('any', 'all'):
+            raise ValueError("dropna_how must be 'any' or 'all'")
+        symbols = [str(t).upper() for t in tickers]
+        # one download: yfinance already fetches each ticker on its own threads
+        data = _get_yf().download(
+                tickers = ' '.join(symbols),
                 period = horizon,
                 interval = "1d",
                 group_by = 'ticker',
                 auto_adjust = False,
-                prepost = True,
                 threads = True,
-                proxy = None
+                proxy = None,
+                progress = False
             )
-        data = data.filter(regex='Close',axis=1)
-        data = data.droplevel(1, axis=1).copy().dropna()
-        data = data.loc[:,~data.columns.duplicated()].copy()
+        if not isinstance(data.columns, pd.MultiIndex):
+            # older yfinance returns flat columns for a single ticker
+            data = pd.concat({symbols[0]: data}, axis=1)
+        data = data.xs('Close', axis=1, level=1)
+        data = data.loc[:,~data.columns.duplicated()]
+        missing = np.isnan(data.to_numpy(dtype=np.float64))
+        keep = ~(missing.any(axis=1) if dropna_how == 'any' else missing.all(axis=1))
+        data = data.iloc[keep]
         return data.reset_index()
 
+    @_normalize_ticker
     def get_stock_quote(self, ticker):
         """
         Get stock quote information for a specific ticker.
@@ -53,9 +221,9 @@ class YFinanceApi:
         :param ticker: The stock ticker symbol.
         :return: A dictionary containing stock quote information.
         """
-        stock = yf.Ticker(ticker.upper())
-        return stock.info
+        return self._info(ticker)
 
+    @_normalize_ticker
     def get_latest_price(self, ticker):
         """
         Get the latest price for a specific ticker.
@@ -63,9 +231,30 @@ class YFinanceApi:
         :param ticker: The stock ticker symbol.
         :return: The latest price of the stock.
         """
-        stock = yf.Ticker(ticker.upper())
-        return stock.info['regularMarketPreviousClose']
+        # fast_info memoizes prices on its Ticker, so read them from a fresh one
+        return _get_yf().Ticker(ticker).fast_info['last_price']
+
+    def get_stock_quotes_batch(self, tickers, max_workers=16):
+        """
+        Get stock quote information for several tickers concurrently.
 
+        :param tickers: A list of stock ticker symbols.
+        :param max_workers: The maximum number of concurrent requests (default 16).
+        :return: A dictionary mapping each ticker to its stock quote information.
+        """
+        return self._batch(self.get_stock_quote, tickers, max_workers)
+
+    def get_latest_prices_batch(self, tickers, max_workers=16):
+        """
+        Get the latest price for several tickers concurrently.
+
+        :param tickers: A list of stock ticker symbols.
+        :param max_workers: The maximum number of concurrent requests (default 16).
+        :return: A dictionary mapping each ticker to its latest price.
+        """
+        return self._batch(self.get_latest_price, tickers, max_workers)
+
+    @_normalize_ticker
     def get_minute_bars(self, ticker, interval='1m', period='7d'):
         """
         Get minute bar data for a specific ticker.
@@ -75,11 +264,12 @@ class YFinanceApi:
         :param period: The period for the data (default is '7d').
         :return: A DataFrame containing minute bar data.
         """
-        stock = yf.Ticker(ticker.upper())
+        stock = self._ticker(ticker)
         df = stock.history(interval=interval, period=period)
-        df.reset_index(inplace=True)
-        return df[['Datetime', 'Open', 'High', 'Low', 'Close', 'Volume']].set_index('Datetime')
+        df.index.name = 'Datetime'
+        return df[['Open', 'High', 'Low', 'Close', 'Volume']]
 
+    @_normalize_ticker
     def get_open_price(self, ticker):
         """
         Get the opening price for a specific ticker.
@@ -87,9 +277,19 @@ class YFinanceApi:
         :param ticker: The stock ticker symbol.
         :return: The opening price of the stock.
         """
-        stock = yf.Ticker(ticker.upper())
-        return stock.info['regularMarketOpen']
+        return _get_yf().Ticker(ticker).fast_info['open']
+
+    def get_open_prices_batch(self, tickers, max_workers=16):
+        """
+        Get the opening price for several tickers concurrently.
+
+        :param tickers: A list of stock ticker symbols.
+        :param max_workers: The maximum number of concurrent requests (default 16).
+        :return: A dictionary mapping each ticker to its opening price.
+        """
+        return self._batch(self.get_open_price, tickers, max_workers)
 
+    @_normalize_ticker
     def get_stock_fundamental(self, ticker):
         """
         Get fundamental information for a specific ticker.
@@ -97,29 +297,54 @@ class YFinanceApi:
         :param ticker: The stock ticker symbol.
         :return: A dictionary containing stock fundamental information.
         """
-        stock = yf.Ticker(ticker.upper())
-        return stock.info
+        return self._info(ticker)
 
+    def get_stock_fundamentals_batch(self, tickers, max_workers=16):
+        """
+        Get fundamental information for several tickers concurrently.
+
+        :param tickers: A list of stock ticker symbols.
+        :param max_workers: The maximum number of concurrent requests (default 16).
+        :return: A dictionary mapping each ticker to its stock fundamental information.
+        """
+        return self._batch(self.get_stock_fundamental, tickers, max_workers)
+
+    @ttl_cache(ttl=_OPTION_TTL)
+    def _option_chain(self, ticker):
+        """
+        Get the shared, cached option chain for a ticker.
+
+        :param ticker: The upper-cased stock ticker symbol.
+        :return: An option chain object callers must not modify.
+        """
+        stock = self._ticker(ticker)
+        return stock.option_chain()
+
+    @_normalize_ticker
     def get_option_chain(self, ticker):
         """
         Get the option chain for a specific ticker.
 
         :param ticker: The stock ticker symbol.
-        :return: An option chain object.
+        :return: An option chain object with its own copies of the calls and puts.
         """
-        stock = yf.Ticker(ticker.upper())
-        return stock.option_chain()
+        chain = self._option_chain(ticker)
+        return chain._replace(calls=chain.calls.copy(), puts=chain.puts.copy())
 
+    @_normalize_ticker
     def get_option_dates(self, ticker):
         """
         Get the option expiration dates for a specific ticker.
 
+        The dates are memoized on the Ticker, so they refresh with it.
+
         :param ticker: The stock ticker symbol.
         :return: A tuple containing option expiration dates.
         """
-        stock = yf.Ticker(ticker.upper())
+        stock = self._ticker(ticker)
         return stock.options
 
+    @_normalize_ticker
     def get_options_data(self, ticker, date, call_or_put=None):
         """
         Get option data for a specific ticker and expiration date.
@@ -129,15 +354,39 @@ class YFinanceApi:
         :param call_or_put: The option type ('call' or 'put', optional).
         :return: A DataFrame containing option data.
         """
-        stock = yf.Ticker(ticker.upper())
+        stock = self._ticker(ticker)
         option_chain = stock.option_chain(date)
+        cols = ['strike', 'bid', 'ask', 'lastPrice']
         if call_or_put == 'call':
-            options_df = option_chain.calls
+            return option_chain.calls[cols]
         elif call_or_put == 'put':
-            options_df = option_chain.puts
-        else:
-            options_df = pd.concat([option_chain.calls, option_chain.puts])
-        return options_df[['strike', 'bid', 'ask', 'lastPrice']]
+            return option_chain.puts[cols]
+        return pd.concat([option_chain.calls[cols], option_chain.puts[cols]], ignore_index=True)
+
+    @_normalize_ticker
+    def get_options_data_all(self, ticker, call_or_put=None, max_workers=8):
+        """
+        Get option data for every expiration date of a specific ticker.
+
+        :param ticker: The stock ticker symbol.
+        :param call_or_put: The option type ('call' or 'put', optional).
+        :param max_workers: The maximum number of concurrent requests (default 8).
+        :return: A DataFrame containing option data with an 'expiry' column.
+        """
+        stock = self._ticker(ticker)
+        dates = stock.options
+        cols = ['strike', 'bid', 'ask', 'lastPrice']
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            chains = list(executor.map(stock.option_chain, dates))
+        frames = []
+        for date, chain in zip(dates, chains):
+            if call_or_put != 'put':
+                frames.append(chain.calls[cols].assign(expiry=date))
+            if call_or_put != 'call':
+                frames.append(chain.puts[cols].assign(expiry=date))
+        if not frames:
+            return pd.DataFrame(columns=cols + ['expiry'])
+        return pd.concat(frames, ignore_index=True)
     
 if __name__ == '__main__':
     yf_api = YFinanceApi()
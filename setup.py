@@ -8,14 +8,23 @@ setup(
     author_email="jwu8715@gmail.com",
     packages=find_packages(),
     install_requires=[
+        "httpx",
+        "numpy",
+        "orjson",
         "pandas",
         "pytz",
         "tda-api",
         "yfinance",
         "robin-stocks",
         "selenium",
+        "tenacity",
         "webdriver-manager",
     ],
+    extras_require={
+        "fast": ["uvloop>=0.18"],
+        "redis": ["redis"],
+        "cache": ["pyarrow"],
+    },
     classifiers=[
         "Development Status :: 3 - Alpha",
         "Intended Audience :: Developers",
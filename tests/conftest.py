@@ -0,0 +1,45 @@
+import importlib
+import sys
+import types
+from pathlib import Path
+from unittest import mock
+
+# the gti modules import each other as top-level modules
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'gti'))
+
+
+def _stub_if_missing(name, **attrs):
+    """
+    Register a bare stand-in for a vendor SDK that is not installed.
+
+    Only module-level names are provided, which is all the tests need to
+    import the gti modules; nothing in them talks to a broker.
+    """
+    try:
+        importlib.import_module(name)
+        return
+    except ImportError:
+        pass
+    parts = name.split('.')
+    for i in range(1, len(parts) + 1):
+        sys.modules.setdefault('.'.join(parts[:i]), types.ModuleType('.'.join(parts[:i])))
+    module = sys.modules[name]
+    for key, value in attrs.items():
+        setattr(module, key, value)
+    for i in range(1, len(parts)):
+        setattr(sys.modules['.'.join(parts[:i])], parts[i], sys.modules['.'.join(parts[:i + 1])])
+
+
+class _Stub:
+    def __init__(self, *args, **kwargs):
+        pass
+
+
+_stub_if_missing('tda.auth')
+_stub_if_missing('tda.client', Client=mock.MagicMock())
+_stub_if_missing('tda.streaming', StreamClient=_Stub)
+_stub_if_missing('selenium.webdriver')
+_stub_if_missing('webdriver_manager.chrome', ChromeDriverManager=_Stub)
+_stub_if_missing('pyotp', TOTP=_Stub)
+for _name in ('authentication', 'helper', 'stocks', 'options', 'markets'):
+    _stub_if_missing(f'robin_stocks.robinhood.{_name}')
@@ -0,0 +1,74 @@
+import threading
+import time
+
+import pytest
+
+import atom
+
+
+def test_requests_in_one_window_are_coalesced():
+    calls = []
+
+    def fetch(symbols):
+        calls.append(symbols)
+        return {s: {'lastPrice': i} for i, s in enumerate(symbols)}
+
+    batcher = atom._QuoteBatcher(fetch, max_wait_ms=200)
+    futures = [batcher.submit(t) for t in ('aapl', 'MSFT', 'AAPL')]
+    quotes = [f.result(timeout=5) for f in futures]
+    assert calls == [['AAPL', 'MSFT']]
+    assert quotes[0] == quotes[2]
+    assert quotes[0] is not quotes[2]
+
+
+def test_fetch_error_reaches_every_future():
+    def fetch(symbols):
+        raise ConnectionError('down')
+
+    batcher = atom._QuoteBatcher(fetch)
+    futures = [batcher.submit(t) for t in ('AAPL', 'MSFT')]
+    for future in futures:
+        with pytest.raises(ConnectionError):
+            future.result(timeout=5)
+
+
+def test_missing_symbol_fails_its_future():
+    batcher = atom._QuoteBatcher(lambda symbols: {})
+    with pytest.raises(KeyError):
+        batcher.submit('AAPL').result(timeout=5)
+
+
+def test_slow_fetch_does_not_block_the_next_batch():
+    release = threading.Event()
+
+    def fetch(symbols):
+        if symbols == ['SLOW']:
+            release.wait(5)
+        return {s: {'lastPrice': 1.0} for s in symbols}
+
+    batcher = atom._QuoteBatcher(fetch, max_wait_ms=10)
+    slow = batcher.submit('SLOW')
+    time.sleep(0.1) # let SLOW's batch close before FAST arrives
+    fast = batcher.submit('FAST')
+    assert fast.result(timeout=5) == {'lastPrice': 1.0}
+    assert not slow.done()
+    release.set()
+    assert slow.result(timeout=5) == {'lastPrice': 1.0}
+
+
+@pytest.mark.filterwarnings('ignore::pytest.PytestUnhandledThreadExceptionWarning')
+def test_worker_restarts_after_dying():
+    batcher = atom._QuoteBatcher(lambda symbols: {s: {'lastPrice': 1.0} for s in symbols})
+    batcher.max_batch = None # makes the collector loop raise
+    with pytest.raises(RuntimeError):
+        batcher.submit('AAPL').result(timeout=5)
+    batcher.max_batch = atom.TD_QUOTE_BATCH_SIZE
+    assert batcher.submit('AAPL').result(timeout=5) == {'lastPrice': 1.0}
+
+
+def test_cached_quote_skips_the_fetch():
+    def fetch(symbols):
+        raise AssertionError('fetch should not be called')
+
+    batcher = atom._QuoteBatcher(fetch, lookup=lambda symbol: {'lastPrice': 2.0})
+    assert batcher.submit('AAPL').result(timeout=5) == {'lastPrice': 2.0}
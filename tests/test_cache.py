@@ -0,0 +1,127 @@
+import pytest
+
+import _cache
+from _cache import TTLCache, ttl_cache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(_cache.time, 'monotonic', clock)
+    return clock
+
+
+def test_entries_expire(clock):
+    cache = TTLCache(ttl=10)
+    cache.set(('quote', 'AAPL'), 1)
+    clock.now += 9
+    assert cache.get(('quote', 'AAPL')) == 1
+    clock.now += 1
+    assert cache.get(('quote', 'AAPL')) is None
+    assert len(cache) == 0
+
+
+def test_per_entry_ttl(clock):
+    cache = TTLCache(ttl=10)
+    cache.set(('quote', 'AAPL'), 1, ttl=1)
+    clock.now += 2
+    assert cache.get(('quote', 'AAPL'), 'miss') == 'miss'
+
+
+def test_least_recently_used_is_evicted(clock):
+    cache = TTLCache(ttl=10, maxsize=2)
+    cache.set(('quote', 'A'), 1)
+    cache.set(('quote', 'B'), 2)
+    cache.get(('quote', 'A'))
+    cache.set(('quote', 'C'), 3)
+    assert cache.get(('quote', 'B')) is None
+    assert cache.get(('quote', 'A')) == 1
+    assert cache.get(('quote', 'C')) == 3
+
+
+def test_invalidate_one_ticker_or_all(clock):
+    cache = TTLCache(ttl=10)
+    cache.set(('quote', 'AAPL'), 1)
+    cache.set(('fundamental', 'AAPL'), 2)
+    cache.set(('quote', 'MSFT'), 3)
+    cache.invalidate('aapl')
+    assert cache.get(('quote', 'AAPL')) is None
+    assert cache.get(('fundamental', 'AAPL')) is None
+    assert cache.get(('quote', 'MSFT')) == 3
+    cache.invalidate()
+    assert len(cache) == 0
+
+
+class Client:
+    def __init__(self):
+        self.calls = 0
+
+    @ttl_cache(ttl=10)
+    def quote(self, ticker, field='last'):
+        self.calls += 1
+        return {'ticker': ticker, 'field': field, 'call': self.calls}
+
+    @ttl_cache(ttl=10, copy=dict)
+    def copied(self, ticker):
+        self.calls += 1
+        return {'ticker': ticker}
+
+
+@pytest.fixture
+def client():
+    Client.quote.invalidate()
+    Client.copied.invalidate()
+    return Client()
+
+
+def test_ttl_cache_keys_by_upper_cased_ticker_and_arguments(clock, client):
+    assert client.quote('aapl') is client.quote('AAPL')
+    assert client.quote('AAPL', field='open')['call'] == 2
+    assert client.calls == 2
+    assert Client.quote.key('aapl') == ('quote', 'AAPL')
+
+
+def test_ttl_cache_refetches_after_expiry(clock, client):
+    client.quote('AAPL')
+    clock.now += 11
+    assert client.quote('AAPL')['call'] == 2
+
+
+def test_ttl_cache_runtime_ttl_applies_to_new_entries(clock, client, monkeypatch):
+    monkeypatch.setattr(Client.quote.cache, 'ttl', 1)
+    client.quote('AAPL')
+    clock.now += 2
+    assert client.quote('AAPL')['call'] == 2
+
+
+def test_ttl_cache_invalidate(clock, client):
+    client.quote('AAPL')
+    Client.quote.invalidate('aapl')
+    assert client.quote('AAPL')['call'] == 2
+
+
+def test_ttl_cache_copy_isolates_callers(clock, client):
+    first = client.copied('AAPL')
+    first['ticker'] = 'CHANGED'
+    second = client.copied('AAPL')
+    assert second == {'ticker': 'AAPL'}
+    assert second is not client.copied('AAPL')
+    assert client.calls == 1
+
+
+def test_add_keeps_a_live_entry(clock):
+    cache = TTLCache(ttl=10)
+    cache.set(('quote', 'AAPL'), 1, ttl=1)
+    cache.add(('quote', 'AAPL'), 2)
+    assert cache.get(('quote', 'AAPL')) == 1
+    clock.now += 1
+    cache.add(('quote', 'AAPL'), 2)
+    assert cache.get(('quote', 'AAPL')) == 2
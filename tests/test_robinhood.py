@@ -0,0 +1,82 @@
+import datetime
+
+import pandas as pd
+import pytest
+
+import robinhood
+
+# four Saturday report dates, so every report falls between two closes
+REPORTS = ['2022-02-05', '2022-05-07', '2022-08-06', '2022-11-05']
+CLOSE_DATES = pd.bdate_range('2022-01-03', '2022-12-30')
+
+
+def _earnings():
+    return [
+        {
+            'year': 2022,
+            'quarter': q + 1,
+            'report': {'date': date},
+            'eps': {'actual': str(q + 1), 'estimate': '1.0'},
+        }
+        for q, date in enumerate(REPORTS)
+    ]
+
+
+def _historicals():
+    return [
+        {'begins_at': f'{d:%Y-%m-%d}T00:00:00Z', 'close_price': str(float(i + 1))}
+        for i, d in enumerate(CLOSE_DATES)
+    ]
+
+
+def _close_on(date):
+    return float(CLOSE_DATES.get_loc(pd.Timestamp(date)) + 1)
+
+
+@pytest.fixture
+def api(monkeypatch):
+    monkeypatch.setattr(robinhood.rs, 'get_earnings', lambda ticker, info=None: _earnings(), raising=False)
+    monkeypatch.setattr(robinhood.rs, 'get_stock_historicals', lambda ticker, **kwargs: _historicals(), raising=False)
+    return robinhood.RobinhoodStocks.__new__(robinhood.RobinhoodStocks)
+
+
+def test_get_earnings_keeps_every_quarter(api):
+    df = api.get_earnings('AAPL')
+    assert list(df['quarter']) == [1, 2, 3, 4]
+    assert list(df['actual_eps']) == [1.0, 2.0, 3.0, 4.0]
+    assert list(df['date']) == [datetime.date.fromisoformat(d) for d in REPORTS]
+    assert df['annual_eps'].iloc[-1] == 10.0
+
+
+def test_get_earnings_without_data_raises(api, monkeypatch):
+    monkeypatch.setattr(robinhood.rs, 'get_earnings', lambda ticker, info=None: [])
+    with pytest.raises(Exception, match='No Data Available'):
+        api.get_earnings('AAPL')
+
+
+def test_get_pe_history_uses_prior_close_for_weekend_report(api):
+    r = api.get_pe_history('AAPL', avg_window=2)
+    # only the last report has four quarters of EPS; the latest close follows it
+    assert list(r['date']) == [datetime.date(2022, 11, 5), datetime.date(2022, 12, 30)]
+    friday = _close_on('2022-11-04')
+    assert r['close'].iloc[0] == friday
+    assert r['pe'].iloc[0] == friday / 10.0
+    assert r['close_avg'].iloc[0] == friday - 0.5
+    assert r['pe'].iloc[1] == _close_on('2022-12-30') / 10.0
+
+
+def test_get_pe_rolling_carries_the_last_report_forward(api):
+    r = api.get_pe_rolling('AAPL')
+    assert r['date'].iloc[0] == datetime.date(2022, 11, 7)
+    assert r['date'].iloc[-1] == datetime.date(2022, 12, 30)
+    assert (r['annual_eps'] == 10.0).all()
+    assert r['pe_ratio'].iloc[0] == _close_on('2022-11-07') / 10.0
+
+
+def test_invalidate_drops_cached_quotes(api, monkeypatch):
+    prices = iter(['1.0', '2.0'])
+    monkeypatch.setattr(robinhood.rs, 'get_quotes', lambda ticker: [{'last_trade_price': next(prices)}], raising=False)
+    api.invalidate()
+    assert api.get_quotes('AAPL') == api.get_quotes('aapl')
+    api.invalidate('AAPL')
+    assert api.get_quotes('AAPL')['last_trade_price'] == '2.0'
@@ -0,0 +1,82 @@
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+import _shared_cache
+import td_ameritrade
+from _shared_cache import SharedCache, SqliteBackend, make_shared_cache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(_shared_cache.time, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def backend(tmp_path):
+    return SqliteBackend(str(tmp_path / 'shared.db'))
+
+
+def test_shared_cache_is_abstract():
+    with pytest.raises(TypeError):
+        SharedCache()
+
+
+def test_get_many_returns_only_found_keys(clock, backend):
+    backend.set_many({'quote:AAPL': {'lastPrice': 1.0}, 'quote:MSFT': {'lastPrice': 2.0}}, ttl=10)
+    assert backend.get_many(['quote:AAPL', 'quote:MSFT', 'quote:XXXX']) == {
+        'quote:AAPL': {'lastPrice': 1.0},
+        'quote:MSFT': {'lastPrice': 2.0},
+    }
+    assert backend.get_many([]) == {}
+    assert backend.get('quote:XXXX') is None
+
+
+def test_entries_expire_with_remaining_ttl(clock, backend):
+    backend.set('quote:AAPL', {'lastPrice': 1.0}, ttl=10)
+    clock.now += 4
+    assert backend.get_with_ttl('quote:AAPL') == ({'lastPrice': 1.0}, 6)
+    clock.now += 6
+    assert backend.get('quote:AAPL') is None
+
+
+def test_expired_rows_are_purged_on_write(clock, backend):
+    backend.set('quote:AAPL', 1, ttl=1)
+    clock.now += 2
+    backend.set('quote:MSFT', 2, ttl=10)
+    rows = backend._conn.execute("SELECT key FROM cache").fetchall()
+    assert rows == [('quote:MSFT',)]
+
+
+def test_make_shared_cache(tmp_path):
+    assert make_shared_cache('') is None
+    assert isinstance(make_shared_cache(str(tmp_path / 'shared.db')), SqliteBackend)
+
+
+def test_shared_quote_hit_keeps_its_remaining_ttl(backend):
+    td_client = td_ameritrade.TDAClient.__new__(td_ameritrade.TDAClient)
+    td_client.shared_cache = backend
+    td_client.client = mock.Mock()
+    td_client._qps_sem = threading.BoundedSemaphore(1)
+    td_client.invalidate()
+    backend.set('quote:AAPL', {'lastPrice': 1.0}, ttl=0.5)
+    try:
+        assert td_client.get_stock_quote('aapl') == {'lastPrice': 1.0}
+        td_client.client.get_quote.assert_not_called()
+        cache = td_ameritrade.TDAClient.get_stock_quote.cache
+        _, expiry = cache._data[td_ameritrade.TDAClient.get_stock_quote.key('AAPL')]
+        assert expiry - time.monotonic() <= 0.5
+    finally:
+        td_client.invalidate()
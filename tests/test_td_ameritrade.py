@@ -0,0 +1,45 @@
+import threading
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import td_ameritrade
+
+
+def test_stream_can_be_restarted(monkeypatch):
+    monkeypatch.setattr(td_ameritrade, 'uvloop', None)
+    stream = td_ameritrade.TdaStream(mock.Mock())
+    seen = []
+    monkeypatch.setattr(stream, 'process_book', lambda msg: seen.append((msg, threading.current_thread())))
+
+    async def read_stream():
+        stream.order_book_handler(len(seen))
+
+    monkeypatch.setattr(stream, 'read_stream', read_stream)
+    stream.start_data_stream()
+    stream.start_data_stream()
+    assert [msg for msg, _ in seen] == [0, 1]
+    assert all(thread is not threading.main_thread() for _, thread in seen)
+    assert stream._pool is None
+
+
+def test_is_trading_hour_vec_accepts_datetimes_in_any_unit():
+    idx = pd.DatetimeIndex(
+        ['2023-05-01 13:29', '2023-05-01 13:30', '2023-05-01 19:59', '2023-05-01 20:00', '2023-05-06 15:00'],
+        tz='UTC',
+    )
+    expected = [td_ameritrade.TDAClient.is_trading_hour(t) for t in idx]
+    assert expected == [False, True, True, False, False]
+    vec = td_ameritrade.TDAClient.is_trading_hour_vec
+    assert list(vec(idx)) == expected
+    assert list(vec(idx.tz_convert('US/Eastern'))) == expected
+    assert list(vec(idx.tz_localize(None).to_numpy().astype('datetime64[us]'))) == expected
+    assert list(vec(idx.tz_localize(None).to_numpy().astype('datetime64[ns]').view(np.int64))) == expected
+    assert list(vec(pd.Series(idx))) == expected
+
+
+def test_is_trading_hour_vec_rejects_other_dtypes():
+    with pytest.raises(TypeError):
+        td_ameritrade.TDAClient.is_trading_hour_vec(np.array([1.5]))
@@ -0,0 +1,166 @@
+import collections
+import datetime
+import types
+
+import pandas as pd
+import pytest
+
+import _cache
+import yahoo
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeTicker:
+    created = []
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+        self.info = {'symbol': symbol, 'build': len(FakeTicker.created)}
+        FakeTicker.created.append(self)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(_cache.time, 'monotonic', clock)
+    return clock
+
+
+@pytest.fixture
+def fake_yf(monkeypatch):
+    FakeTicker.created = []
+    module = types.SimpleNamespace(Ticker=FakeTicker)
+    monkeypatch.setattr(yahoo, '_get_yf', lambda: module)
+    return module
+
+
+def test_ticker_is_reused_within_ttl(clock, fake_yf):
+    api = yahoo.YFinanceApi()
+    first = api.get_stock_quote('aapl')
+    clock.now += yahoo._TICKER_TTL - 1
+    second = api.get_stock_quote('AAPL')
+    assert first == second
+    assert first is not second
+    assert len(FakeTicker.created) == 1
+
+
+def test_info_edits_do_not_leak(clock, fake_yf):
+    api = yahoo.YFinanceApi()
+    api.get_stock_fundamental('AAPL')['symbol'] = 'CHANGED'
+    assert api.get_stock_fundamental('AAPL')['symbol'] == 'AAPL'
+
+
+def test_ticker_is_rebuilt_after_ttl(clock, fake_yf):
+    api = yahoo.YFinanceApi()
+    first = api.get_stock_fundamental('AAPL')
+    clock.now += yahoo._TICKER_TTL + 1
+    second = api.get_stock_fundamental('AAPL')
+    assert len(FakeTicker.created) == 2
+    assert first['build'] == 0
+    assert second['build'] == 1
+
+
+def test_prices_use_a_fresh_ticker(clock, fake_yf):
+    FakeTicker.fast_info = property(lambda self: {'last_price': len(FakeTicker.created), 'open': 1.0})
+    try:
+        api = yahoo.YFinanceApi()
+        assert api.get_latest_price('AAPL') != api.get_latest_price('AAPL')
+    finally:
+        del FakeTicker.fast_info
+
+
+def test_option_chain_returns_copies(clock, fake_yf):
+    Options = collections.namedtuple('Options', ['calls', 'puts', 'underlying'])
+    FakeTicker.option_chain = lambda self: Options(pd.DataFrame({'strike': [1.0]}), pd.DataFrame({'strike': [2.0]}), {})
+    try:
+        api = yahoo.YFinanceApi()
+        calls = api.get_option_chain('AAPL').calls
+        calls.loc[0, 'strike'] = 99.0
+        assert api.get_option_chain('AAPL').calls.loc[0, 'strike'] == 1.0
+    finally:
+        del FakeTicker.option_chain
+
+
+def test_empty_history_returns_empty_bars(clock, fake_yf, tmp_path):
+    columns = ['Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume']
+    FakeTicker.history = lambda self, **kwargs: pd.DataFrame(columns=columns, index=pd.Index([], name='Date'))
+    try:
+        api = yahoo.YFinanceApi()
+        api._cache_dir = tmp_path
+        bars = api.get_historical_daily_bar('XXXX', '2020-01-01', '2020-02-01')
+        assert bars.empty
+        assert isinstance(bars.index, pd.DatetimeIndex)
+        arrays = api.get_historical_daily_bar_arrays('XXXX', '2020-01-01', '2020-02-01')
+        assert all(len(a) == 0 for a in arrays)
+        assert not list(tmp_path.iterdir())
+    finally:
+        del FakeTicker.history
+
+
+def test_unwritable_cache_dir_still_returns_bars(clock, fake_yf, tmp_path):
+    index = pd.DatetimeIndex(['2020-01-02', '2020-01-03'], name='Date')
+    frame = pd.DataFrame({col: [1.0, 2.0] for col in ['Open', 'High', 'Low', 'Close', 'Volume']}, index=index)
+    FakeTicker.history = lambda self, **kwargs: frame
+    try:
+        blocker = tmp_path / 'not_a_dir'
+        blocker.write_text('')
+        api = yahoo.YFinanceApi()
+        api._cache_dir = blocker / 'cache'
+        bars = api.get_historical_daily_bar('AAPL', '2020-01-01', '2020-02-01')
+        assert list(bars['Close']) == [1.0, 2.0]
+    finally:
+        del FakeTicker.history
+
+
+def test_closed_range_is_cached_on_disk(clock, fake_yf, tmp_path):
+    pytest.importorskip('pyarrow')
+    index = pd.DatetimeIndex(['2020-01-02', '2020-01-03'], name='Date')
+    frame = pd.DataFrame({col: [1.0, 2.0] for col in ['Open', 'High', 'Low', 'Close', 'Volume']}, index=index)
+    calls = []
+    FakeTicker.history = lambda self, **kwargs: calls.append(kwargs) or frame
+    try:
+        api = yahoo.YFinanceApi()
+        api._cache_dir = tmp_path
+        api.get_historical_daily_bar('AAPL', '2020-01-01', '2020-02-01')
+        bars = api.get_historical_daily_bar('aapl', datetime.date(2020, 1, 1), pd.Timestamp('2020-02-01'))
+        assert len(calls) == 1
+        assert list(bars['Close']) == [1.0, 2.0]
+        assert [p.name for p in tmp_path.iterdir()] == ['AAPL_2020-01-01_2020-02-01_adjusted.parquet']
+    finally:
+        del FakeTicker.history
+
+
+def _fake_download(calls):
+    def download(tickers, **kwargs):
+        symbols = tickers.split()
+        calls.append(symbols)
+        index = pd.DatetimeIndex(['2020-01-02', '2020-01-03'], name='Date')
+        if len(symbols) == 1:
+            return pd.DataFrame({'Open': [1.0, 2.0], 'Close': [1.5, 2.5]}, index=index)
+        columns = pd.MultiIndex.from_product([symbols, ['Open', 'Close']])
+        return pd.DataFrame(1.0, index=index, columns=columns)
+    return download
+
+
+def test_yf_data_multi_downloads_once(fake_yf):
+    calls = []
+    fake_yf.download = _fake_download(calls)
+    tickers = [f't{i}' for i in range(21)]
+    data = yahoo.YFinanceApi().yf_data_multi(tickers, '1y')
+    assert len(calls) == 1
+    assert list(data.columns) == ['Date'] + [t.upper() for t in tickers]
+    assert len(data) == 2
+
+
+def test_yf_data_multi_single_ticker_flat_columns(fake_yf):
+    fake_yf.download = _fake_download([])
+    data = yahoo.YFinanceApi().yf_data_multi(['spy'], '1y')
+    assert list(data.columns) == ['Date', 'SPY']
+    assert list(data['SPY']) == [1.5, 2.5]